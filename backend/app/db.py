@@ -6,38 +6,63 @@ Why async?
 - Better performance under load
 - Required for Supabase connection pooling
 
-Why NullPool?
-- Supabase uses Supavisor (their connection pooler) on port 6543
-- We let Supabase handle pooling, not SQLAlchemy
-- Prevents "too many connections" errors
+Why a client-side pool?
+- We connect through Supavisor in session mode (port 5432)
+- Reusing connections avoids a TCP + TLS handshake on every request
+- Session mode keeps asyncpg's prepared statement cache working
+- Pool size stays small to respect Supavisor's per-client limits: each
+  worker holds up to DB_POOL_SIZE + DB_POOL_OVERFLOW + DB_RAW_POOL_MAX
+  connections (5 + 5 + 5 by default)
+
+Why a raw asyncpg pool too?
+- Simple read endpoints (books, chapters, health) don't need SQLAlchemy
+- asyncpg Records skip SQLAlchemy's compile + row-wrapping overhead
 """
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
+import asyncpg
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from contextlib import asynccontextmanager
 
 from app.config import settings
+from app.vector_codecs import register_vector_codecs
 
 
 # Create async engine for PostgreSQL
-# NullPool: Let Supabase handle connection pooling
+# SQLAlchemy picks AsyncAdaptedQueuePool for async engines automatically
 engine = create_async_engine(
     settings.SUPABASE_DB_URL,
-    poolclass=NullPool,
-    # Supabase Supavisor requires these settings
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_POOL_OVERFLOW,
+    pool_pre_ping=True,  # Drop connections Supavisor closed behind our back
+    pool_recycle=1800,  # Recycle connections every 30 minutes
+    pool_timeout=30,
+    echo=settings.DEBUG,  # Log SQL queries in debug mode
     connect_args={
-        "statement_cache_size": 0,
-        "prepared_statement_cache_size": 0,
+        # asyncpg's own cache and SQLAlchemy's adapter cache: the search
+        # queries have fixed SQL text, so each connection parses/plans once
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
     },
-    echo=settings.DEBUG,  # Log SQL queries in debug mode
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_vector_codec(dbapi_connection, connection_record):
+    """
+    Register pgvector's binary codecs on every new pooled connection.
+
+    Query embeddings are then bound as numpy arrays and sent as raw
+    floats (2-4 bytes per dimension) instead of decimal text.
+    """
+    dbapi_connection.run_async(register_vector_codecs)
+
+
 # Session factory for creating database sessions
-async_session_maker = sessionmaker(
+async_session_maker = async_sessionmaker(
     engine,
-    class_=AsyncSession,
     expire_on_commit=False,  # Don't expire objects after commit
+    autoflush=False,  # All routes are read-only, nothing to flush
 )
 
 
@@ -51,10 +76,17 @@ async def get_db():
             result = await db.execute(query)
     """
     async with async_session_maker() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
+
+
+def get_pool_stats() -> dict:
+    """Connection pool usage of the SQLAlchemy engine (for /health)."""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checkedout": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
 
 
 async def get_db_session():
@@ -67,7 +99,50 @@ async def get_db_session():
             result = await db.execute(query)
     """
     async with async_session_maker() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
+
+
+# Raw asyncpg pool for hot read-only endpoints
+# Created in the app lifespan (pool creation is async)
+_pg_pool: asyncpg.Pool | None = None
+
+
+def _asyncpg_dsn(url: str) -> str:
+    """asyncpg needs the URL without the SQLAlchemy +asyncpg driver suffix."""
+    return url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+async def init_pg_pool() -> asyncpg.Pool:
+    """Create the shared asyncpg pool (called once at startup)."""
+    global _pg_pool
+    if _pg_pool is None:
+        _pg_pool = await asyncpg.create_pool(
+            _asyncpg_dsn(settings.SUPABASE_DB_URL),
+            min_size=settings.DB_RAW_POOL_MIN,
+            max_size=settings.DB_RAW_POOL_MAX,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        )
+    return _pg_pool
+
+
+async def close_pg_pool() -> None:
+    """Close the shared asyncpg pool (called once at shutdown)."""
+    global _pg_pool
+    if _pg_pool is not None:
+        await _pg_pool.close()
+        _pg_pool = None
+
+
+async def get_pg_pool() -> asyncpg.Pool:
+    """
+    FastAPI dependency for the raw asyncpg pool.
+
+    Usage in routes:
+        @router.get("/items")
+        async def get_items(pool: asyncpg.Pool = Depends(get_pg_pool)):
+            async with pool.acquire() as conn:
+                rows = await conn.fetch("SELECT ...")
+    """
+    if _pg_pool is None:
+        return await init_pg_pool()
+    return _pg_pool
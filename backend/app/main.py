@@ -4,13 +4,15 @@ Smart Hadith Search API
 FastAPI application with hybrid semantic + keyword search.
 """
 
+import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
-from app.db import async_session_maker
+from app.db import init_pg_pool, close_pg_pool, get_pg_pool, get_pool_stats
 from app.routers import search, hadiths, books
 
 
@@ -22,23 +24,44 @@ async def lifespan(app: FastAPI):
     Startup:
     - Pre-load the embedding model (~440MB) so first search is fast
     - Model stays in memory for the lifetime of the app
+    - Warm the model up with a dummy encode (WARMUP_EMBEDDINGS)
+    - Start the query embedding micro-batcher
+    - Open the asyncpg pool used by the catalog endpoints
 
     Shutdown:
     - Clean up resources
+
+    Workers:
+    - Every worker process runs this lifespan and loads its own model
+    - Never load it before fork (see gunicorn.conf.py): ONNX Runtime
+      sessions and CUDA contexts do not survive into forked workers
     """
     # Startup: Load embedding model into memory
     print("Starting up Smart Hadith Search API...")
     print("Loading embedding model (this may take a moment on first run)...")
 
-    from app.services.embeddings import get_embedding_model
+    from app.services.embeddings import (
+        embedding_batcher,
+        get_embedding_model,
+        warmup_embedding_model,
+    )
     model = get_embedding_model()
     print(f"Embedding model loaded: {settings.EMBEDDING_MODEL}")
     print(f"Embedding dimension: {model.get_sentence_embedding_dimension()}")
 
+    if settings.WARMUP_EMBEDDINGS:
+        warmup_embedding_model()
+        print("Embedding model warmed up")
+
+    embedding_batcher.start()
+    await init_pg_pool()
+
     yield  # App is running
 
     # Shutdown
     print("Shutting down...")
+    await embedding_batcher.stop()
+    await close_pg_pool()
 
 
 app = FastAPI(
@@ -49,6 +72,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    # orjson serializes responses several times faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Middleware
@@ -60,33 +85,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount routers
-app.include_router(
-    search.router, prefix=settings.API_V1_PREFIX, tags=["Search"]
-)
-app.include_router(
-    hadiths.router, prefix=settings.API_V1_PREFIX, tags=["Hadiths"]
-)
-app.include_router(
-    books.router, prefix=settings.API_V1_PREFIX, tags=["Books"]
-)
+# Gzip Middleware - hadith pages carry long multilingual text (100KB+ JSON)
+# Small responses like /health stay below minimum_size and are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
+# Mount routers (prefix resolved once)
+api_prefix = settings.API_V1_PREFIX
+app.include_router(search.router, prefix=api_prefix, tags=["Search"])
+app.include_router(hadiths.router, prefix=api_prefix, tags=["Hadiths"])
+app.include_router(books.router, prefix=api_prefix, tags=["Books"])
 
-@app.get("/health", tags=["Health"])
-async def health_check():
-    """
-    Check if API and database are working.
 
-    Used by deployment platforms for health monitoring.
-    """
+# Probes fire every few seconds; reuse a recent result instead of hitting the DB
+HEALTH_CACHE_SECONDS = 5
+_last_health: tuple[float, dict] | None = None
+
+# Planner estimate - reads one catalog row instead of scanning hadiths.
+# The regclass cast pins the lookup to the table itself (not an index or a
+# same-named relation in another schema).
+_SQL_ESTIMATE_HADITHS = (
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = 'public.hadiths'::regclass"
+)
+_SQL_COUNT_HADITHS = "SELECT COUNT(*) FROM hadiths"
+
+
+async def _check_database(estimate: bool) -> dict:
+    """Count hadiths (estimated or exact) and build the health payload."""
     try:
-        async with async_session_maker() as session:
-            result = await session.execute(text("SELECT COUNT(*) FROM hadiths"))
-            count = result.scalar()
+        pool = await get_pg_pool()
+        async with pool.acquire() as conn:
+            count = await conn.fetchval(_SQL_ESTIMATE_HADITHS) if estimate else None
+            if count is None or count <= 0:
+                # Never analyzed (reltuples is -1, or 0 before PostgreSQL 14):
+                # count exactly rather than report a meaningless number
+                count = await conn.fetchval(_SQL_COUNT_HADITHS)
             return {
                 "status": "healthy",
                 "database": "connected",
                 "total_hadiths": count,
+                "pool": get_pool_stats(),
             }
     except Exception as e:
         return {
@@ -94,3 +131,35 @@ async def health_check():
             "database": "error",
             "error": str(e),
         }
+
+
+@app.get("/health", tags=["Health"])
+async def health_check():
+    """
+    Check if API and database are working.
+
+    Used by deployment platforms for health monitoring.
+    The hadith count is the planner estimate from pg_class (no table scan),
+    and healthy results are reused for HEALTH_CACHE_SECONDS. A failed check
+    is never cached, so recovery shows up on the next probe.
+    """
+    global _last_health
+
+    now = time.monotonic()
+    if _last_health is not None and now - _last_health[0] < HEALTH_CACHE_SECONDS:
+        return _last_health[1]
+
+    payload = await _check_database(estimate=True)
+    if payload["status"] == "healthy":
+        _last_health = (now, payload)
+    return payload
+
+
+@app.get("/health/deep", tags=["Health"])
+async def deep_health_check():
+    """
+    Check API and database with an exact hadith count.
+
+    Runs a full COUNT(*) - for manual/admin checks, not for probes.
+    """
+    return await _check_database(estimate=False)
@@ -26,8 +26,9 @@ class SearchRequest(BaseModel):
 
     # Optional fields - can be None or omitted
     # pattern validates against regex: only en, ar, bn, ur allowed
+    # When set, results carry only this language as text/narrator
     lang: Optional[str] = Field(
-        None, pattern="^(en|ar|bn|ur)$", description="Filter by language"
+        None, pattern="^(en|ar|bn|ur)$", description="Only return this language's text"
     )
 
     # ge=1 means "greater than or equal to 1"
@@ -50,14 +51,18 @@ class HadithResult(BaseModel):
     chapter_id: int
     hadith_number: int
     grade_id: Optional[int]  # Some hadiths don't have grades
-    en_text: Optional[str]  # English translation (may be missing)
-    ar_text: str  # Arabic is always present
-    bn_text: Optional[str]  # Bengali
-    ur_text: Optional[str]  # Urdu
-    en_narrator: Optional[str]
-    ar_narrator: Optional[str]
-    bn_narrator: Optional[str]
-    ur_narrator: Optional[str]
+    # All languages by default; omitted when the request sets lang
+    en_text: Optional[str] = None  # English translation (may be missing)
+    ar_text: Optional[str] = None  # Arabic is always present in the data
+    bn_text: Optional[str] = None  # Bengali
+    ur_text: Optional[str] = None  # Urdu
+    en_narrator: Optional[str] = None
+    ar_narrator: Optional[str] = None
+    bn_narrator: Optional[str] = None
+    ur_narrator: Optional[str] = None
+    # Only present when the request sets lang
+    text: Optional[str] = None
+    narrator: Optional[str] = None
     book_title: str
     book_title_bn: Optional[str]
     book_slug: str
@@ -138,6 +143,13 @@ class ChaptersResponse(BaseModel):
     chapters: list[Chapter]
 
 
+class BookWithChapters(BaseModel):
+    """Response from GET /books/{id}/full (book + chapters in one call)"""
+
+    book: Book
+    chapters: list[Chapter]
+
+
 class HadithListItem(BaseModel):
     """Hadith item for list/browse views (simpler, no joined fields)"""
     hadith_id: int
@@ -160,9 +172,10 @@ class PaginatedHadiths(BaseModel):
 
     results: list[HadithListItem]
     total: int  # Total hadiths matching filter
-    page: int  # Current page number
+    page: Optional[int]  # Current page number (None in cursor mode)
     per_page: int  # Items per page
-    pages: int  # Total number of pages
+    pages: Optional[int]  # Total number of pages (None in cursor mode)
+    next_cursor: Optional[int] = None  # Pass as ?cursor= for the next page
 
 
 class HealthResponse(BaseModel):
@@ -2,93 +2,229 @@
 Books Router - Browse hadith collections
 
 Updated for async PostgreSQL access.
+Catalog endpoints use the raw asyncpg pool (no SQLAlchemy overhead).
+The catalog only changes on redeploy, so its queries are cached in-process.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import text
+import hashlib
+from typing import NamedTuple
+
+import orjson
+from async_lru import alru_cache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db_session
+from app.config import settings
+from app.db import get_db_session, get_pg_pool
 from app.models.schemas import (
     BooksResponse,
     Book,
+    BookWithChapters,
     ChaptersResponse,
     PaginatedHadiths,
 )
-import search as search_module
+from app.services import search as search_module
 
 router = APIRouter()
 
+# Catalog queries (asyncpg placeholders), built once at import
+# Explicit column lists: only what the Book/Chapter schemas return
+_SQL_LIST_BOOKS = """
+    SELECT
+        b.book_id, b.slug, b.en_title, b.ar_title, b.bn_title, b.ur_title,
+        b.description, COUNT(h.hadith_id) as hadith_count
+    FROM books b
+    LEFT JOIN hadiths h ON h.book_id = b.book_id
+    GROUP BY b.book_id
+    ORDER BY b.book_id
+"""
 
-@router.get("/books", response_model=BooksResponse)
-async def get_books(db: AsyncSession = Depends(get_db_session)):
-    """
-    List all hadith books with hadith counts.
+_SQL_GET_BOOK = """
+    SELECT
+        b.book_id, b.slug, b.en_title, b.ar_title, b.bn_title, b.ur_title,
+        b.description, COUNT(h.hadith_id) as hadith_count
+    FROM books b
+    LEFT JOIN hadiths h ON h.book_id = b.book_id
+    WHERE b.book_id = $1
+    GROUP BY b.book_id
+"""
 
-    Returns: Sahih Bukhari, Sunan an-Nasa'i, etc.
-    """
-    sql = text("""
-        SELECT b.*, COUNT(h.hadith_id) as hadith_count
+_SQL_LIST_CHAPTERS = """
+    SELECT
+        c.chapter_id, c.order_index, c.en_title, c.ar_title, c.bn_title,
+        c.ur_title, COUNT(h.hadith_id) as hadith_count
+    FROM chapters c
+    LEFT JOIN hadiths h ON h.chapter_id = c.chapter_id
+    WHERE c.book_id = $1
+    GROUP BY c.chapter_id
+    ORDER BY c.order_index
+"""
+
+# Book + chapters in one round-trip, assembled as JSON by PostgreSQL
+_SQL_GET_BOOK_FULL = """
+    WITH b AS (
+        SELECT
+            b.book_id, b.slug, b.en_title, b.ar_title, b.bn_title, b.ur_title,
+            b.description, COUNT(h.hadith_id) as hadith_count
         FROM books b
         LEFT JOIN hadiths h ON h.book_id = b.book_id
+        WHERE b.book_id = $1
         GROUP BY b.book_id
-        ORDER BY b.book_id
-    """)
+    ),
+    c AS (
+        SELECT
+            c.chapter_id, c.order_index, c.en_title, c.ar_title, c.bn_title,
+            c.ur_title, COUNT(h.hadith_id) as hadith_count
+        FROM chapters c
+        LEFT JOIN hadiths h ON h.chapter_id = c.chapter_id
+        WHERE c.book_id = $1
+        GROUP BY c.chapter_id
+    )
+    SELECT json_build_object(
+        'book', (SELECT row_to_json(b) FROM b),
+        'chapters', COALESCE(
+            (SELECT json_agg(c ORDER BY c.order_index) FROM c), '[]'::json
+        )
+    )
+"""
+
 
-    result = await db.execute(sql)
-    books = [dict(row._mapping) for row in result.fetchall()]
+class _CatalogBody(NamedTuple):
+    """A serialized catalog response and its ETag."""
 
-    return {"books": books}
+    body: bytes
+    etag: str
+
+
+def _serialize(payload: dict) -> _CatalogBody:
+    """
+    Serialize once per cache fill, so a 304 costs no encoding or hashing.
+
+    The ETag is weak: GZipMiddleware sends the same tag on both the gzip
+    and the identity encoding, which are not byte-identical.
+    """
+    body = orjson.dumps(payload)
+    etag = 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return _CatalogBody(body, etag)
+
+
+@alru_cache(maxsize=1, ttl=settings.CATALOG_CACHE_TTL)
+async def _fetch_books() -> _CatalogBody:
+    """All books with hadith counts (cached)."""
+    pool = await get_pg_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(_SQL_LIST_BOOKS)
+
+    return _serialize({"books": [dict(r) for r in rows]})
+
+
+@alru_cache(maxsize=64, ttl=settings.CATALOG_CACHE_TTL)
+async def _fetch_book(book_id: int) -> _CatalogBody | None:
+    """A single book with hadith count, or None if missing (cached)."""
+    pool = await get_pg_pool()
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(_SQL_GET_BOOK, book_id)
+
+    return _serialize(dict(row)) if row is not None else None
+
+
+@alru_cache(maxsize=64, ttl=settings.CATALOG_CACHE_TTL)
+async def _fetch_chapters(book_id: int) -> _CatalogBody:
+    """Chapters of a book with hadith counts (cached)."""
+    pool = await get_pg_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(_SQL_LIST_CHAPTERS, book_id)
+
+    return _serialize({"book_id": book_id, "chapters": [dict(r) for r in rows]})
+
+
+@alru_cache(maxsize=64, ttl=settings.CATALOG_CACHE_TTL)
+async def _fetch_book_full(book_id: int) -> _CatalogBody | None:
+    """A book and its chapters, or None if the book is missing (cached)."""
+    pool = await get_pg_pool()
+    async with pool.acquire() as conn:
+        raw = await conn.fetchval(_SQL_GET_BOOK_FULL, book_id)
+
+    data = orjson.loads(raw)
+    return _serialize(data) if data["book"] is not None else None
+
+
+def _cacheable_response(request: Request, cached: _CatalogBody) -> Response:
+    """
+    Send cached catalog data with ETag + Cache-Control headers.
+
+    Browsers and CDNs revalidate with If-None-Match and get a 304
+    (no body) while the catalog is unchanged.
+    """
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": (
+            f"public, max-age={settings.CATALOG_CACHE_TTL}, "
+            "stale-while-revalidate=86400"
+        ),
+    }
+
+    # Weak comparison (RFC 9110): W/ prefixes are ignored on both sides
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
+    if cached.etag.removeprefix("W/") in client_etags or "*" in client_etags:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+@router.get("/books", response_model=BooksResponse)
+async def get_books(request: Request):
+    """
+    List all hadith books with hadith counts.
+
+    Returns: Sahih Bukhari, Sunan an-Nasa'i, etc.
+    """
+    return _cacheable_response(request, await _fetch_books())
 
 
 @router.get("/books/{book_id}", response_model=Book)
-async def get_book(
-    book_id: int,
-    db: AsyncSession = Depends(get_db_session),
-):
+async def get_book(book_id: int, request: Request):
     """Get a single book by ID with hadith count."""
-    sql = text("""
-        SELECT b.*, COUNT(h.hadith_id) as hadith_count
-        FROM books b
-        LEFT JOIN hadiths h ON h.book_id = b.book_id
-        WHERE b.book_id = :book_id
-        GROUP BY b.book_id
-    """)
-
-    result = await db.execute(sql, {"book_id": book_id})
-    row = result.fetchone()
+    book = await _fetch_book(book_id)
 
-    if row is None:
+    if book is None:
         raise HTTPException(
             status_code=404, detail=f"Book {book_id} not found"
         )
 
-    return dict(row._mapping)
+    return _cacheable_response(request, book)
 
 
 @router.get("/books/{book_id}/chapters", response_model=ChaptersResponse)
-async def get_chapters(
-    book_id: int,
-    db: AsyncSession = Depends(get_db_session),
-):
+async def get_chapters(book_id: int, request: Request):
     """
     List all chapters in a book with hadith counts.
 
     Chapters are ordered by order_index for proper display.
     """
-    sql = text("""
-        SELECT c.*, COUNT(h.hadith_id) as hadith_count
-        FROM chapters c
-        LEFT JOIN hadiths h ON h.chapter_id = c.chapter_id
-        WHERE c.book_id = :book_id
-        GROUP BY c.chapter_id
-        ORDER BY c.order_index
-    """)
+    return _cacheable_response(request, await _fetch_chapters(book_id))
 
-    result = await db.execute(sql, {"book_id": book_id})
-    chapters = [dict(row._mapping) for row in result.fetchall()]
 
-    return {"book_id": book_id, "chapters": chapters}
+@router.get("/books/{book_id}/full", response_model=BookWithChapters)
+async def get_book_full(book_id: int, request: Request):
+    """
+    Get a book and all its chapters in a single request.
+
+    Same data as /books/{id} + /books/{id}/chapters, fetched in one
+    database round-trip.
+    """
+    data = await _fetch_book_full(book_id)
+
+    if data is None:
+        raise HTTPException(
+            status_code=404, detail=f"Book {book_id} not found"
+        )
+
+    return _cacheable_response(request, data)
 
 
 @router.get("/books/{book_id}/hadiths", response_model=PaginatedHadiths)
@@ -100,12 +236,17 @@ async def get_book_hadiths(
     per_page: int = Query(
         50, ge=1, le=100, description="Items per page (max 100)"
     ),
+    cursor: int = Query(
+        None, description="Continue after this hadith_number (keyset pagination)"
+    ),
 ):
     """
     Get hadiths from a book with pagination.
 
     Use chapter_id to filter by specific chapter.
     Pagination prevents loading thousands of hadiths at once.
+    For deep pages, pass the previous response's next_cursor as cursor
+    instead of a page number.
     """
     result = await search_module.get_book_hadiths(
         db=db,
@@ -113,5 +254,7 @@ async def get_book_hadiths(
         chapter_id=chapter_id,
         page=page,
         per_page=per_page,
+        cursor=cursor,
     )
-    return result
+    # Rows are already shaped by the SQL - skip response_model re-validation
+    return ORJSONResponse(result)
@@ -5,11 +5,12 @@ Updated for async PostgreSQL access.
 """
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db_session
 from app.models.schemas import HadithDetail
-import search as search_module
+from app.services import search as search_module
 
 router = APIRouter()
 
@@ -32,4 +33,5 @@ async def get_hadith(
             status_code=404, detail=f"Hadith {hadith_id} not found"
         )
 
-    return result
+    # Row is already shaped by the SQL - skip response_model re-validation
+    return ORJSONResponse(result)
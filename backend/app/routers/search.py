@@ -9,12 +9,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db_session
 from app.models.schemas import SearchRequest, SearchResponse
-import search as search_module
+from app.services import search as search_module
 
 router = APIRouter()
 
 
-@router.post("/search", response_model=SearchResponse)
+# exclude_unset: drop the text columns a lang-narrowed search never selected
+@router.post("/search", response_model=SearchResponse, response_model_exclude_unset=True)
 async def search_hadiths(
     request: SearchRequest,
     db: AsyncSession = Depends(get_db_session),
@@ -27,7 +28,8 @@ async def search_hadiths(
     - **Full-text search**: Matches exact keywords
     - **RRF fusion**: Combines both rankings for best results
 
-    Supports Arabic, English, Bengali, and Urdu queries.
+    Supports Arabic, English, Bengali, and Urdu queries. Set `lang` to get
+    only that language back, as `text` and `narrator`.
 
     Example request:
     ```json
@@ -43,6 +45,7 @@ async def search_hadiths(
             query=request.query,
             book_id=request.book_id,
             limit=request.limit,
+            lang=request.lang,
         )
         return result
     except Exception as e:
@@ -8,6 +8,8 @@ How it works:
 1. Load the model once at startup (cached in memory)
 2. For searches: Convert user query to embedding (~10ms)
 3. For migration: Batch convert all hadiths to embeddings
+4. Concurrent search queries are micro-batched into one encode() call,
+   and repeated queries are served from an LRU cache
 
 Model: paraphrase-multilingual-MiniLM-L12-v2
 - 384 dimensions
@@ -15,29 +17,169 @@ Model: paraphrase-multilingual-MiniLM-L12-v2
 - ~440MB download (first time only)
 """
 
+import asyncio
+import platform
+from contextlib import suppress
 from functools import lru_cache
-from sentence_transformers import SentenceTransformer
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from async_lru import alru_cache
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    # torch + sentence-transformers are heavy; only import them when loading
+    from sentence_transformers import SentenceTransformer
+
+
+# Dynamically quantized ONNX file per quantization config, as named by
+# sentence-transformers' export (and in the hub's prebuilt onnx/ folder).
+# The config must match the serving CPU: the avx512_vnni model's u8s8
+# MatMuls can saturate on AVX2-only hosts, which degrades the embeddings
+ONNX_QUANTIZED_FILES = {
+    "arm64": "onnx/model_qint8_arm64.onnx",
+    "avx2": "onnx/model_quint8_avx2.onnx",
+    "avx512": "onnx/model_qint8_avx512.onnx",
+    "avx512_vnni": "onnx/model_qint8_avx512_vnni.onnx",
+}
+
+# Fields joined (in this order, newline-separated) into the embedded text:
+# English narrator + text, then the Arabic original
+HADITH_TEXT_FIELDS = ("en_narrator", "en_text", "ar_narrator", "ar_text")
+
+# One short text per supported script (Arabic, English, Bengali, Urdu)
+WARMUP_TEXTS = ["بسم الله", "In the name of Allah", "শুরুতে", "اللہ کے نام سے"]
+
+
+def detect_onnx_qconfig() -> str:
+    """Pick the int8 quantization config for this host's CPU."""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "arm64"
+
+    flags: set[str] = set()
+    with suppress(OSError):
+        for line in Path("/proc/cpuinfo").read_text().splitlines():
+            if line.startswith("flags"):
+                flags = set(line.partition(":")[2].split())
+                break
+
+    if "avx512_vnni" in flags:
+        return "avx512_vnni"
+    if "avx512f" in flags:
+        return "avx512"
+    return "avx2"
+
+
+def get_onnx_qconfig() -> str:
+    """EMBEDDING_ONNX_QCONFIG, or the config detected for this host."""
+    qconfig = settings.EMBEDDING_ONNX_QCONFIG or detect_onnx_qconfig()
+    if qconfig not in ONNX_QUANTIZED_FILES:
+        raise ValueError(
+            f"Unknown EMBEDDING_ONNX_QCONFIG {qconfig!r}, "
+            f"expected one of {', '.join(ONNX_QUANTIZED_FILES)}"
+        )
+    return qconfig
+
+
+def export_quantized_onnx(onnx_dir: Path, qconfig: str) -> None:
+    """
+    Export the model to ONNX and save an int8 dynamically quantized copy.
+
+    Slow and needs the Hugging Face hub: run it at build time
+    (scripts/export_onnx_model.py), never on the request path.
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    print(f"Exporting {settings.EMBEDDING_MODEL} to ONNX ({qconfig})...")
+    model = SentenceTransformer(settings.EMBEDDING_MODEL, backend="onnx")
+    model.save_pretrained(str(onnx_dir))
+    export_dynamic_quantized_onnx_model(model, qconfig, str(onnx_dir))
+    print(f"Quantized ONNX model saved to {onnx_dir}")
+
+
+def get_torch_device() -> str:
+    """Pick the fastest available torch device: CUDA, then Apple MPS, then CPU."""
+    import torch
+
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
 
 @lru_cache(maxsize=1)
-def get_embedding_model() -> SentenceTransformer:
+def get_embedding_model() -> "SentenceTransformer":
     """
     Load and cache the embedding model.
 
     The model is loaded once and kept in memory for fast inference.
     First call downloads the model (~440MB) if not cached locally.
 
+    With EMBEDDING_QUANTIZED on a CPU-only host, the model runs on ONNX Runtime
+    with int8 dynamically quantized MatMuls, quantized for this CPU (see
+    get_onnx_qconfig) and read from EMBEDDING_MODEL_ONNX or the hub. Pooling and normalization still come from
+    sentence-transformers, so encode() output is unchanged in shape.
+    Otherwise the PyTorch model is used on the best available device (fp16
+    on CUDA), optionally with torch.compile.
+
     Returns:
         SentenceTransformer: The loaded model ready for encoding
     """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
     print(f"Loading embedding model: {settings.EMBEDDING_MODEL}")
-    model = SentenceTransformer(settings.EMBEDDING_MODEL)
+    device = get_torch_device()
+
+    if settings.EMBEDDING_QUANTIZED and device == "cpu":
+        qconfig = get_onnx_qconfig()
+        file_name = ONNX_QUANTIZED_FILES[qconfig]
+        onnx_dir = Path(settings.EMBEDDING_MODEL_ONNX)
+        # Exported at build time; otherwise the hub's prebuilt file
+        # (a download, not an export)
+        source = str(onnx_dir) if (onnx_dir / file_name).exists() else settings.EMBEDDING_MODEL
+
+        model = SentenceTransformer(
+            source,
+            backend="onnx",
+            model_kwargs={"file_name": file_name},
+        )
+        print(f"Using int8 quantized ONNX Runtime model ({qconfig})")
+    else:
+        model = SentenceTransformer(settings.EMBEDDING_MODEL, device=device)
+        if device == "cuda":
+            model.half()
+        print(f"Using PyTorch model on {device}")
+
+        if settings.EMBEDDING_COMPILE:
+            # model[0] is the sentence-transformers Transformer module wrapping
+            # the Hugging Face AutoModel. Kernels are compiled on the first
+            # encode, which is why warmup must run before serving traffic.
+            # dynamic=True: query lengths vary, avoid recompiling per length
+            model[0].auto_model = torch.compile(
+                model[0].auto_model, mode="reduce-overhead", dynamic=True
+            )
+            print("Model compiled with torch.compile")
+
     print(f"Model loaded. Embedding dimension: {model.get_sentence_embedding_dimension()}")
     return model
 
 
+def warmup_embedding_model() -> None:
+    """
+    Run one throwaway encode so the first real query is fast.
+
+    The first encode() lazily builds tokenizer tables and kernels, which
+    would otherwise add 1-3s to the first search request.
+    SentenceTransformer already places the model on GPU when available.
+    """
+    model = get_embedding_model()
+    model.encode(WARMUP_TEXTS, normalize_embeddings=True, batch_size=len(WARMUP_TEXTS))
+
+
 def generate_embedding(text: str) -> list[float]:
     """
     Generate embedding for a single text (used for search queries).
@@ -81,14 +223,145 @@ def generate_embeddings_batch(
     if not texts:
         return []
 
+    # Batches are padded to their longest text, so encode in length order
+    # and scatter the results back. SentenceTransformer.encode() sorts on its
+    # own too, but doing it here keeps the guarantee whatever the backend.
+    order = np.argsort([len(t) for t in texts], kind="stable")
     model = get_embedding_model()
     embeddings = model.encode(
-        texts,
+        [texts[i] for i in order],
         batch_size=batch_size,
         normalize_embeddings=True,
         show_progress_bar=show_progress,
     )
-    return embeddings.tolist()
+    return embeddings[np.argsort(order)].tolist()
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batch concurrent query embeddings.
+
+    A single-query forward pass leaves most of the matmul throughput
+    unused. Queries arriving within a short window are queued and encoded
+    together in one encode() call (run in a worker thread so the event
+    loop stays free); each caller awaits its own future.
+
+    Usage:
+        embedding_batcher.start()       # in app startup
+        emb = await embedding_batcher.encode("patience")
+        await embedding_batcher.stop()  # in app shutdown
+    """
+
+    def __init__(self, max_batch: int = 32, max_wait_ms: float = 8.0):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the background batching task on the running loop."""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Cancel the background task and fail every query still waiting.
+
+        Callers in flight at shutdown get an error right away instead of
+        hanging on a future nothing will resolve.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+            pending = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._fail(pending, RuntimeError("Embedding batcher stopped"))
+            self._queue = None
+
+    async def encode(self, text: str) -> list[float]:
+        """Embed one query, batched with any concurrent callers."""
+        if not text or not text.strip():
+            return []
+
+        if self._task is None:
+            # Batcher not running (scripts, tests): encode directly
+            return await asyncio.to_thread(generate_embedding, text)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    def _drain(self, batch: list) -> None:
+        """Move already-queued items into the batch (up to max_batch)."""
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+    @staticmethod
+    def _fail(batch: list, error: BaseException) -> None:
+        """Resolve every unfinished future in the batch with an error."""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                self._drain(batch)
+                if len(batch) < self.max_batch:
+                    # Give concurrent requests a moment to join this batch
+                    await asyncio.sleep(self.max_wait)
+                    self._drain(batch)
+
+                texts = [text for text, _ in batch]
+                embeddings = await asyncio.to_thread(
+                    generate_embeddings_batch,
+                    texts,
+                    batch_size=len(texts),
+                    show_progress=False,
+                )
+            except asyncio.CancelledError:
+                # Stopped mid-batch: these were already taken off the queue
+                self._fail(batch, RuntimeError("Embedding batcher stopped"))
+                raise
+            except Exception as e:
+                self._fail(batch, e)
+                continue
+
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
+# Shared batcher used by the search endpoints
+embedding_batcher = EmbeddingBatcher(
+    max_batch=settings.EMBEDDING_BATCH_MAX,
+    max_wait_ms=settings.EMBEDDING_BATCH_WAIT_MS,
+)
+
+
+@alru_cache(maxsize=settings.QUERY_EMBEDDING_CACHE_SIZE)
+async def embed_query(query: str) -> np.ndarray:
+    """
+    Embed a search query, with an in-process LRU cache in front of the model.
+
+    Repeated queries (pagination, re-clicks, popular searches) skip the
+    forward pass entirely; concurrent identical queries share one encode.
+    Callers should pass the stripped query so whitespace variants share
+    an entry.
+
+    Returns:
+        Read-only float32 array (cached entries are shared), empty for a
+        blank query
+    """
+    embedding = np.asarray(await embedding_batcher.encode(query), dtype=np.float32)
+    embedding.flags.writeable = False
+    return embedding
 
 
 def prepare_hadith_text(hadith: dict) -> str:
@@ -107,25 +380,10 @@ def prepare_hadith_text(hadith: dict) -> str:
     Returns:
         Combined text string ready for embedding
     """
-    parts = []
-
-    # English content
-    if hadith.get("en_narrator"):
-        parts.append(hadith["en_narrator"])
-    if hadith.get("en_text"):
-        parts.append(hadith["en_text"])
+    return "\n".join(hadith[k] for k in HADITH_TEXT_FIELDS if hadith.get(k))
 
-    # Arabic content (original language)
-    if hadith.get("ar_narrator"):
-        parts.append(hadith["ar_narrator"])
-    if hadith.get("ar_text"):
-        parts.append(hadith["ar_text"])
 
-    # Join with newlines for clear separation
-    return "\n".join(parts)
-
-
-def compute_similarity(embedding1: list[float], embedding2: list[float]) -> float:
+def compute_similarity(embedding1: np.ndarray, embedding2: np.ndarray) -> float:
     """
     Compute cosine similarity between two embeddings.
 
@@ -134,8 +392,22 @@ def compute_similarity(embedding1: list[float], embedding2: list[float]) -> floa
     Returns:
         Similarity score between 0 and 1 (1 = identical meaning)
     """
-    if not embedding1 or not embedding2:
+    if embedding1.size == 0 or embedding2.size == 0:
         return 0.0
 
     # Dot product of normalized vectors = cosine similarity
-    return sum(a * b for a, b in zip(embedding1, embedding2))
+    return float(np.dot(embedding1, embedding2))
+
+
+def compute_similarities(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Compute cosine similarity of one query against many embeddings.
+
+    Args:
+        query: Normalized query embedding, shape (dim,)
+        matrix: Normalized candidate embeddings, shape (n, dim)
+
+    Returns:
+        Array of n similarity scores, in the row order of matrix
+    """
+    return matrix @ query
@@ -0,0 +1,588 @@
+"""
+Hybrid Search Module for Smart Hadith Search
+
+This module implements semantic + full-text hybrid search using:
+- pgvector: Vector similarity search (semantic meaning)
+- PostgreSQL tsvector: Full-text search (keyword matching)
+- RRF (Reciprocal Rank Fusion): Combines both rankings
+
+How it works:
+1. User enters a query (e.g., "patience in hardship")
+2. Query is converted to an embedding vector
+3. Two parallel searches run:
+   - Semantic: Find hadiths with similar embeddings
+   - Full-text: Find hadiths containing the keywords
+4. Results are combined using RRF for final ranking
+"""
+
+import asyncio
+import re
+
+import numpy as np
+from async_lru import alru_cache
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import async_session_maker, get_pg_pool
+from app.services.embeddings import embed_query
+
+# The query embedding is a bound parameter (not spliced into the SQL), so the
+# statement text is identical on every call and asyncpg reuses its prepared
+# statement instead of re-parsing and re-planning. It is sent as a numpy array
+# through pgvector's binary codec (registered in app.db), not as text.
+# The search function is called directly in FROM (no CTE) so the planner
+# can inline it and join on hadiths_pkey without materializing its result.
+
+# Hybrid search legs: each returns ranked hadith_ids only, and the two
+# rankings are fused in Python (see _rrf_fuse). The vector leg reuses the
+# semantic_search function; the full-text leg matches its SQL counterpart.
+# RRF ranks by row position, so both legs order explicitly: a function's
+# internal ORDER BY is not guaranteed to survive the outer SELECT.
+_SQL_SEMANTIC_IDS = text("""
+    SELECT hadith_id, similarity
+    FROM semantic_search(CAST(:embedding AS halfvec), :match_count, :book_id)
+    ORDER BY similarity DESC
+""")
+
+_SQL_FULLTEXT_IDS = text("""
+    SELECT h.hadith_id
+    FROM hadiths h
+    WHERE h.fts_en @@ websearch_to_tsquery('english', :query_text)
+      AND (:book_id IS NULL OR h.book_id = :book_id)
+    ORDER BY ts_rank_cd(h.fts_en, websearch_to_tsquery('english', :query_text)) DESC
+    LIMIT :match_count
+""")
+
+# Languages a search response can be narrowed to (see _text_columns)
+RESULT_LANGS = ("en", "ar", "bn", "ur")
+
+
+def _text_columns(lang: str | None) -> str:
+    """
+    SELECT list for the hadith text columns of a search result.
+
+    With no lang every translation is returned. With a lang only that
+    language's text and narrator come back, as `text` and `narrator`:
+    the text columns are by far the widest, so this cuts the bytes Postgres
+    detoasts and sends and the JSON we encode to roughly a quarter.
+
+    lang is spliced into the SQL, so it must be one of RESULT_LANGS.
+    """
+    if lang is None:
+        return ",\n        ".join(
+            f"h.{code}_{field}" for field in ("text", "narrator") for code in RESULT_LANGS
+        )
+    if lang not in RESULT_LANGS:
+        raise ValueError(f"Unsupported result language: {lang!r}")
+    return f"h.{lang}_text AS text,\n        h.{lang}_narrator AS narrator"
+
+
+# Full details for the fused ids, in one round-trip
+_HYDRATE_HADITHS = """
+    SELECT
+        h.hadith_id,
+        h.book_id,
+        h.chapter_id,
+        h.hadith_number,
+        h.grade_id,
+        {text_columns},
+        b.en_title as book_title,
+        b.bn_title as book_title_bn,
+        b.slug as book_slug,
+        g.en_text as grade_text,
+        g.bn_text as grade_text_bn
+    FROM hadiths h
+    JOIN books b ON b.book_id = h.book_id
+    LEFT JOIN grades g ON g.grade_id = h.grade_id
+    WHERE h.hadith_id = ANY(:ids)
+"""
+
+_SEMANTIC_SEARCH = """
+    SELECT
+        h.hadith_id,
+        h.book_id,
+        h.chapter_id,
+        h.hadith_number,
+        h.grade_id,
+        {text_columns},
+        b.en_title as book_title,
+        b.bn_title as book_title_bn,
+        b.slug as book_slug,
+        g.en_text as grade_text,
+        g.bn_text as grade_text_bn,
+        r.similarity as score
+    FROM semantic_search(
+        CAST(:embedding AS halfvec),
+        :match_count,
+        :book_id
+    ) r
+    JOIN hadiths h ON h.hadith_id = r.hadith_id
+    JOIN books b ON b.book_id = h.book_id
+    LEFT JOIN grades g ON g.grade_id = h.grade_id
+    ORDER BY r.similarity DESC
+"""
+
+# One fixed statement per projection (None = all languages), so each keeps
+# its prepared-statement cache entry
+_SQL_HYDRATE_HADITHS = {
+    lang: text(_HYDRATE_HADITHS.format(text_columns=_text_columns(lang)))
+    for lang in (None, *RESULT_LANGS)
+}
+_SQL_SEMANTIC_SEARCH = {
+    lang: text(_SEMANTIC_SEARCH.format(text_columns=_text_columns(lang)))
+    for lang in (None, *RESULT_LANGS)
+}
+
+
+_SQL_SET_EF_SEARCH = text("SELECT set_config('hnsw.ef_search', :ef_search, true)")
+
+
+async def _set_ef_search(db: AsyncSession, candidates: int) -> None:
+    """
+    Set hnsw.ef_search for the current transaction.
+
+    An HNSW index scan returns at most ef_search rows, so it must cover
+    the number of nearest neighbours the search function asks for.
+    Book-filtered searches sort exactly and never touch the index, so
+    callers skip this round-trip for them.
+    """
+    ef_search = max(settings.HNSW_EF_SEARCH, candidates)
+    await db.execute(_SQL_SET_EF_SEARCH, {"ef_search": str(ef_search)})
+
+
+async def _semantic_ids(
+    embedding: np.ndarray, match_count: int, book_id: int | None
+) -> list[int]:
+    """
+    Vector leg of hybrid search: hadith ids by embedding similarity.
+
+    Runs on its own session so it can overlap with the full-text leg;
+    an AsyncSession can only run one statement at a time.
+    """
+    async with async_session_maker() as session:
+        if book_id is None:
+            await _set_ef_search(session, match_count)
+        result = await session.execute(_SQL_SEMANTIC_IDS, {
+            "embedding": embedding,
+            "match_count": match_count,
+            "book_id": book_id,
+        })
+        # First column only: similarity is selected just to order by
+        return result.scalars().all()
+
+
+async def _fulltext_ids(
+    db: AsyncSession, query: str, match_count: int, book_id: int | None
+) -> list[int]:
+    """Full-text leg of hybrid search: hadith ids by ts_rank_cd."""
+    result = await db.execute(_SQL_FULLTEXT_IDS, {
+        "query_text": query,
+        "match_count": match_count,
+        "book_id": book_id,
+    })
+    return result.scalars().all()
+
+
+def _rrf_fuse(*rankings: tuple[list[int], float], k: int) -> dict[int, float]:
+    """
+    Reciprocal Rank Fusion: score = sum of weight / (k + rank) per ranking.
+
+    Args:
+        rankings: (ids in rank order, weight) pairs
+        k: RRF constant (higher = flatter blend of the rankings)
+
+    Returns:
+        hadith_id -> fused score
+    """
+    scores: dict[int, float] = {}
+    for ids, weight in rankings:
+        for rank, hadith_id in enumerate(ids, start=1):
+            scores[hadith_id] = scores.get(hadith_id, 0.0) + weight / (k + rank)
+    return scores
+
+
+_ARABIC_RE = re.compile(r"[\u0600-\u06FF]")
+_BENGALI_RE = re.compile(r"[\u0980-\u09FF]")
+
+
+def detect_language(query: str) -> str:
+    """
+    Detect the primary language of a query.
+
+    Uses Unicode ranges to identify scripts:
+    - Arabic: U+0600-U+06FF
+    - Bengali: U+0980-U+09FF
+    - Default: English
+
+    Args:
+        query: User's search query
+
+    Returns:
+        Language code: 'ar', 'bn', or 'en'
+    """
+    if query.isascii():
+        # Most queries are plain English: skip both regex scans
+        return "en"
+    if _BENGALI_RE.search(query):
+        return "bn"
+    if _ARABIC_RE.search(query):
+        # Could be Arabic or Urdu (both use Arabic script)
+        return "ar"
+    return "en"
+
+
+async def hybrid_search(
+    db: AsyncSession,
+    query: str,
+    book_id: int | None = None,
+    limit: int = 20,
+    lang: str | None = None,
+) -> dict:
+    """
+    Perform hybrid search combining semantic and full-text search.
+
+    This is the main search function that:
+    1. Generates an embedding for the query
+    2. Fetches the top semantic and full-text hadith ids (2x limit each),
+       concurrently on two connections
+    3. Fuses the two rankings with RRF in Python
+    4. Fetches full hadith details for the best `limit` ids
+
+    Args:
+        db: Async database session
+        query: User's search query
+        book_id: Optional filter by book
+        limit: Maximum results to return
+        lang: Only return this language's text/narrator (all when None)
+
+    Returns:
+        Dictionary with query info and ranked results
+    """
+    query = query.strip()
+    if not query:
+        return {"query": "", "query_lang": "en", "count": 0, "results": []}
+
+    query_lang = detect_language(query)
+
+    # Generate embedding for semantic search (cached per query text)
+    query_embedding = await embed_query(query)
+
+    if query_embedding.size == 0:
+        # Fallback to full-text only if embedding fails
+        return await fulltext_search(db, query, book_id, limit, query_lang, lang)
+
+    candidates = limit * 2
+
+    # The HNSW scan and the tsvector scan run at the same time, on two
+    # connections (and so two Postgres backends)
+    semantic_ids, fulltext_ids = await asyncio.gather(
+        _semantic_ids(query_embedding, candidates, book_id),
+        _fulltext_ids(db, query, candidates, book_id),
+    )
+
+    scores = _rrf_fuse(
+        (semantic_ids, settings.SEMANTIC_WEIGHT),
+        (fulltext_ids, settings.FULLTEXT_WEIGHT),
+        k=settings.RRF_K,
+    )
+    top_ids = sorted(scores, key=scores.get, reverse=True)[:limit]
+
+    rows = []
+    if top_ids:
+        result = await db.execute(_SQL_HYDRATE_HADITHS[lang], {"ids": top_ids})
+        by_id = {row["hadith_id"]: dict(row) for row in result.mappings()}
+        for hadith_id in top_ids:
+            row = by_id[hadith_id]
+            row["score"] = scores[hadith_id]
+            rows.append(row)
+
+    return {
+        "query": query,
+        "query_lang": query_lang,
+        "count": len(rows),
+        "results": rows,
+    }
+
+
+async def semantic_search(
+    db: AsyncSession,
+    query: str,
+    book_id: int | None = None,
+    limit: int = 20,
+    lang: str | None = None,
+) -> dict:
+    """
+    Pure semantic search (embedding similarity only).
+
+    Use this when you want meaning-based search without keyword matching.
+    Useful for conceptual queries like "being kind to parents".
+
+    Args:
+        db: Async database session
+        query: User's search query
+        book_id: Optional filter by book
+        limit: Maximum results to return
+        lang: Only return this language's text/narrator (all when None)
+
+    Returns:
+        Dictionary with query info and ranked results
+    """
+    query = query.strip()
+    if not query:
+        return {"query": "", "query_lang": "en", "count": 0, "results": []}
+
+    query_lang = detect_language(query)
+    query_embedding = await embed_query(query)
+
+    if query_embedding.size == 0:
+        return {"query": query, "query_lang": query_lang, "count": 0, "results": []}
+
+    if book_id is None:
+        await _set_ef_search(db, limit)
+
+    result = await db.execute(_SQL_SEMANTIC_SEARCH[lang], {
+        "embedding": query_embedding,
+        "match_count": limit,
+        "book_id": book_id,
+    })
+
+    rows = [dict(m) for m in result.mappings().all()]
+
+    return {
+        "query": query,
+        "query_lang": query_lang,
+        "count": len(rows),
+        "results": rows,
+    }
+
+
+async def fulltext_search(
+    db: AsyncSession,
+    query: str,
+    book_id: int | None = None,
+    limit: int = 20,
+    query_lang: str = "en",
+    lang: str | None = None,
+) -> dict:
+    """
+    Pure full-text search (keyword matching only).
+
+    Fallback when embedding generation fails or for exact phrase matching.
+
+    Args:
+        db: Async database session
+        query: User's search query
+        book_id: Optional filter by book
+        limit: Maximum results to return
+        query_lang: Detected query language
+        lang: Only return this language's text/narrator (all when None)
+
+    Returns:
+        Dictionary with query info and ranked results
+    """
+    # Choose the appropriate tsvector column based on language
+    fts_column = "fts_ar" if query_lang == "ar" else "fts_en"
+    ts_config = "simple" if query_lang == "ar" else "english"
+    text_columns = _text_columns(lang)
+
+    sql = text(f"""
+        SELECT
+            h.hadith_id,
+            h.book_id,
+            h.chapter_id,
+            h.hadith_number,
+            h.grade_id,
+            {text_columns},
+            b.en_title as book_title,
+            b.bn_title as book_title_bn,
+            b.slug as book_slug,
+            g.en_text as grade_text,
+            g.bn_text as grade_text_bn,
+            ts_rank_cd(h.{fts_column}, websearch_to_tsquery('{ts_config}', :query)) as score
+        FROM hadiths h
+        JOIN books b ON b.book_id = h.book_id
+        LEFT JOIN grades g ON g.grade_id = h.grade_id
+        WHERE h.{fts_column} @@ websearch_to_tsquery('{ts_config}', :query)
+          AND (:book_id IS NULL OR h.book_id = :book_id)
+        ORDER BY score DESC
+        LIMIT :limit
+    """)
+
+    result = await db.execute(sql, {
+        "query": query,
+        "book_id": book_id,
+        "limit": limit,
+    })
+
+    rows = [dict(m) for m in result.mappings().all()]
+
+    return {
+        "query": query,
+        "query_lang": query_lang,
+        "count": len(rows),
+        "results": rows,
+    }
+
+
+async def get_hadith(db: AsyncSession, hadith_id: int) -> dict | None:
+    """
+    Get a single hadith by ID with full details.
+
+    Args:
+        db: Async database session
+        hadith_id: The hadith's primary key
+
+    Returns:
+        Dictionary with hadith details or None if not found
+    """
+    sql = text("""
+        SELECT
+            h.*,
+            b.en_title as book_title,
+            b.bn_title as book_title_bn,
+            b.slug as book_slug,
+            c.en_title as chapter_title,
+            c.bn_title as chapter_title_bn,
+            g.en_text as grade_text,
+            g.bn_text as grade_text_bn
+        FROM hadiths h
+        JOIN books b ON b.book_id = h.book_id
+        JOIN chapters c ON c.chapter_id = h.chapter_id
+        LEFT JOIN grades g ON g.grade_id = h.grade_id
+        WHERE h.hadith_id = :hadith_id
+    """)
+
+    result = await db.execute(sql, {"hadith_id": hadith_id})
+    row = result.mappings().first()
+
+    if row:
+        row_dict = dict(row)
+        # Remove the embedding from response (too large, not needed)
+        row_dict.pop("embedding", None)
+        row_dict.pop("fts_en", None)
+        row_dict.pop("fts_ar", None)
+        return row_dict
+    return None
+
+
+_SQL_COUNT_BOOK_HADITHS = "SELECT COUNT(*) FROM hadiths WHERE book_id = $1"
+_SQL_COUNT_CHAPTER_HADITHS = (
+    "SELECT COUNT(*) FROM hadiths WHERE book_id = $1 AND chapter_id = $2"
+)
+
+
+@alru_cache(maxsize=1024, ttl=settings.CATALOG_CACHE_TTL)
+async def _count_book_hadiths(book_id: int, chapter_id: int | None) -> int:
+    """
+    Hadiths in a book, or in one of its chapters (cached).
+
+    Counted apart from the page query (an index-only scan), so the page
+    query can stop at LIMIT on its (book_id, [chapter_id,] hadith_number)
+    index instead of reading the whole book to count it. The counts only
+    change on redeploy, like the catalog.
+    """
+    pool = await get_pg_pool()
+    async with pool.acquire() as conn:
+        if chapter_id is None:
+            return await conn.fetchval(_SQL_COUNT_BOOK_HADITHS, book_id)
+        return await conn.fetchval(_SQL_COUNT_CHAPTER_HADITHS, book_id, chapter_id)
+
+
+async def get_book_hadiths(
+    db: AsyncSession,
+    book_id: int,
+    chapter_id: int | None = None,
+    page: int = 1,
+    per_page: int = 50,
+    cursor: int | None = None,
+) -> dict:
+    """
+    Get hadiths by book with pagination.
+
+    Two pagination modes:
+    - page: classic LIMIT/OFFSET (cost grows with page depth)
+    - cursor: keyset pagination on hadith_number - pass the previous
+      response's next_cursor to continue; cost does not grow with depth
+
+    In both modes total comes from a cached per-book/chapter count, so
+    only the first request for a book or chapter pays for counting it.
+
+    Args:
+        db: Async database session
+        book_id: Book to fetch from
+        chapter_id: Optional chapter filter
+        page: Page number (1-indexed), ignored when cursor is given
+        per_page: Results per page
+        cursor: Optional hadith_number to continue after
+
+    Returns:
+        Dictionary with paginated results and metadata (page and pages
+        are None in cursor mode)
+    """
+    # Build WHERE clause dynamically (asyncpg can't infer NULL parameter types)
+    where_clause = "h.book_id = :book_id"
+    params = {"book_id": book_id}
+
+    if chapter_id is not None:
+        where_clause += " AND h.chapter_id = :chapter_id"
+        params["chapter_id"] = chapter_id
+
+    # Fetch one extra row to know whether another page exists
+    fetch_params = {**params, "limit": per_page + 1}
+    if cursor is not None:
+        page_clause = "AND h.hadith_number > :cursor"
+        limit_clause = "LIMIT :limit"
+        fetch_params["cursor"] = cursor
+    else:
+        page_clause = ""
+        limit_clause = "LIMIT :limit OFFSET :offset"
+        fetch_params["offset"] = (page - 1) * per_page
+
+    # Only the HadithListItem columns
+    sql = text(f"""
+        SELECT
+            h.hadith_id,
+            h.book_id,
+            h.chapter_id,
+            h.hadith_number,
+            h.grade_id,
+            h.en_text,
+            h.ar_text,
+            h.bn_text,
+            h.ur_text,
+            h.en_narrator,
+            h.ar_narrator,
+            h.bn_narrator,
+            h.ur_narrator,
+            g.en_text as grade_text
+        FROM hadiths h
+        LEFT JOIN grades g ON g.grade_id = h.grade_id
+        WHERE {where_clause} {page_clause}
+        ORDER BY h.hadith_number
+        {limit_clause}
+    """)
+
+    result = await db.execute(sql, fetch_params)
+
+    rows = [dict(m) for m in result.mappings().all()]
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    # Same total in both modes, and a cache hit after the first page
+    total = await _count_book_hadiths(book_id, chapter_id)
+
+    if cursor is None:
+        pages = (total + per_page - 1) // per_page if total else 0
+    else:
+        # Keyset pages have no page number; follow next_cursor instead
+        page = pages = None
+
+    return {
+        "results": rows,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "pages": pages,
+        "next_cursor": rows[-1]["hadith_number"] if has_more else None,
+    }
@@ -0,0 +1,34 @@
+"""
+pgvector binary codecs for asyncpg connections.
+
+pgvector's register_vector() assumes the extension lives in `public`, but
+enabling it from the Supabase dashboard installs it into `extensions`.
+The schema is looked up from the catalog (once per process) unless
+PGVECTOR_SCHEMA pins it, so the codecs resolve either way.
+"""
+
+import asyncpg
+from pgvector.asyncpg import register_vector
+
+from app.config import settings
+
+_SQL_VECTOR_SCHEMA = """
+    SELECT n.nspname
+    FROM pg_type t
+    JOIN pg_namespace n ON n.oid = t.typnamespace
+    WHERE t.typname = 'vector'
+"""
+
+# Looked up on the first connection, reused for the rest
+_vector_schema: str | None = settings.PGVECTOR_SCHEMA or None
+
+
+async def register_vector_codecs(conn: asyncpg.Connection) -> None:
+    """Register the vector/halfvec/sparsevec codecs in pgvector's schema."""
+    global _vector_schema
+    if _vector_schema is None:
+        _vector_schema = await conn.fetchval(_SQL_VECTOR_SCHEMA)
+        if _vector_schema is None:
+            raise RuntimeError("pgvector is not installed (CREATE EXTENSION vector)")
+
+    await register_vector(conn, schema=_vector_schema)
@@ -0,0 +1,113 @@
+-- ============================================================
+-- 002: Store embeddings as halfvec (fp16)
+-- ============================================================
+-- For databases created from an older supabase_schema.sql (new installs
+-- already have this). Requires pgvector >= 0.7. Run once in the Supabase
+-- SQL Editor, after 001.
+--
+-- halfvec halves the bytes per embedding (768 instead of 1536), which
+-- halves the HNSW index and the memory read per distance computation.
+-- Cosine ranking of the normalized sentence embeddings is unaffected in
+-- practice.
+
+-- The functions' argument type changes, so drop the vector versions
+-- rather than adding halfvec overloads next to them
+DROP FUNCTION IF EXISTS hybrid_search(TEXT, vector, INT, FLOAT, FLOAT, INT, INT);
+DROP FUNCTION IF EXISTS semantic_search(vector, INT, INT);
+
+DROP INDEX IF EXISTS idx_hadiths_embedding;
+
+ALTER TABLE hadiths
+    ALTER COLUMN embedding TYPE halfvec(384) USING embedding::halfvec(384);
+
+CREATE INDEX IF NOT EXISTS idx_hadiths_embedding ON hadiths
+    USING hnsw (embedding halfvec_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+CREATE OR REPLACE FUNCTION hybrid_search(
+    query_text TEXT,
+    query_embedding halfvec(384),
+    match_count INT DEFAULT 20,
+    full_text_weight FLOAT DEFAULT 1.0,
+    semantic_weight FLOAT DEFAULT 1.0,
+    rrf_k INT DEFAULT 60,
+    filter_book_id INT DEFAULT NULL
+)
+RETURNS TABLE(
+    hadith_id INT,
+    score FLOAT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH nearest AS (
+        -- Semantic search: nearest embeddings straight off the HNSW index.
+        -- The book filter is applied afterwards (over-fetching 3x) so it
+        -- never turns the index scan into a filtered sequential scan.
+        SELECT h.hadith_id, h.book_id, h.embedding <=> query_embedding AS distance
+        FROM hadiths h
+        WHERE h.embedding IS NOT NULL
+        ORDER BY h.embedding <=> query_embedding
+        LIMIT match_count * 2 * CASE WHEN filter_book_id IS NULL THEN 1 ELSE 3 END
+    ),
+    semantic AS (
+        SELECT
+            n.hadith_id,
+            ROW_NUMBER() OVER (ORDER BY n.distance) AS rank
+        FROM nearest n
+        WHERE filter_book_id IS NULL OR n.book_id = filter_book_id
+        ORDER BY n.distance
+        LIMIT match_count * 2
+    ),
+    fulltext AS (
+        -- Full-text search: find hadiths matching keywords
+        SELECT
+            h.hadith_id,
+            ROW_NUMBER() OVER (
+                ORDER BY ts_rank_cd(h.fts_en, plainto_tsquery('english', query_text)) DESC
+            ) AS rank
+        FROM hadiths h
+        WHERE h.fts_en @@ plainto_tsquery('english', query_text)
+          AND (filter_book_id IS NULL OR h.book_id = filter_book_id)
+        ORDER BY rank
+        LIMIT match_count * 2
+    )
+    -- Combine using Reciprocal Rank Fusion
+    -- RRF score = sum of 1/(k + rank) for each search method
+    SELECT
+        COALESCE(s.hadith_id, f.hadith_id) AS hadith_id,
+        (
+            COALESCE(semantic_weight / (rrf_k + s.rank), 0.0) +
+            COALESCE(full_text_weight / (rrf_k + f.rank), 0.0)
+        ) AS score
+    FROM semantic s
+    FULL OUTER JOIN fulltext f ON s.hadith_id = f.hadith_id
+    ORDER BY score DESC
+    LIMIT match_count;
+$$;
+
+CREATE OR REPLACE FUNCTION semantic_search(
+    query_embedding halfvec(384),
+    match_count INT DEFAULT 20,
+    filter_book_id INT DEFAULT NULL
+)
+RETURNS TABLE(
+    hadith_id INT,
+    similarity FLOAT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT n.hadith_id, 1 - n.distance AS similarity
+    FROM (
+        -- HNSW index scan first, book filter after (see hybrid_search)
+        SELECT h.hadith_id, h.book_id, h.embedding <=> query_embedding AS distance
+        FROM hadiths h
+        WHERE h.embedding IS NOT NULL
+        ORDER BY h.embedding <=> query_embedding
+        LIMIT match_count * CASE WHEN filter_book_id IS NULL THEN 1 ELSE 3 END
+    ) n
+    WHERE filter_book_id IS NULL OR n.book_id = filter_book_id
+    ORDER BY n.distance
+    LIMIT match_count;
+$$;
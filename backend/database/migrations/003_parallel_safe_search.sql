@@ -0,0 +1,12 @@
+-- ============================================================
+-- 003: Mark the search functions PARALLEL SAFE
+-- ============================================================
+-- For databases created from an older supabase_schema.sql (new installs
+-- already have this). Run once in the Supabase SQL Editor, after 002.
+--
+-- The API now calls the functions directly in FROM instead of through a
+-- CTE. Being STABLE + PARALLEL SAFE SQL functions lets the planner inline
+-- them into the calling query and use parallel plans.
+
+ALTER FUNCTION hybrid_search(TEXT, halfvec, INT, FLOAT, FLOAT, INT, INT) PARALLEL SAFE;
+ALTER FUNCTION semantic_search(halfvec, INT, INT) PARALLEL SAFE;
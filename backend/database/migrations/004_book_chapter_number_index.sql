@@ -0,0 +1,16 @@
+-- ============================================================
+-- 004: Index chapter browsing in hadith_number order
+-- ============================================================
+-- For databases created from an older supabase_schema.sql (new installs
+-- already have this). Run once in the Supabase SQL Editor.
+--
+-- get_book_hadiths filters on book_id (+ chapter_id) and orders by
+-- hadith_number. With hadith_number in the index, a chapter page is an
+-- ordered index range scan that stops at LIMIT instead of a sort over the
+-- whole chapter. It also covers (book_id, chapter_id) lookups, so the old
+-- two-column index is redundant.
+
+CREATE INDEX IF NOT EXISTS idx_hadiths_book_chapter_number
+    ON hadiths(book_id, chapter_id, hadith_number);
+
+DROP INDEX IF EXISTS idx_hadiths_book_chapter;
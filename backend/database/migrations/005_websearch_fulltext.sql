@@ -0,0 +1,82 @@
+-- ============================================================
+-- 005: Web-search query syntax and GIN indexes without fastupdate
+-- ============================================================
+-- For databases created from an older supabase_schema.sql (new installs
+-- already have this). Run once in the Supabase SQL Editor.
+--
+-- The full-text indexes are read-only after the import, so the fastupdate
+-- pending list only adds a scan to every search. Turning it off and
+-- flushing what is pending leaves a plain GIN posting-tree lookup.
+--
+-- hybrid_search switches to websearch_to_tsquery, like the API queries:
+-- it accepts "quoted phrases", OR and -excluded words, and never raises on
+-- malformed input.
+
+ALTER INDEX idx_hadiths_fts_en SET (fastupdate = off);
+ALTER INDEX idx_hadiths_fts_ar SET (fastupdate = off);
+SELECT gin_clean_pending_list('idx_hadiths_fts_en');
+SELECT gin_clean_pending_list('idx_hadiths_fts_ar');
+
+CREATE OR REPLACE FUNCTION hybrid_search(
+    query_text TEXT,
+    query_embedding halfvec(384),
+    match_count INT DEFAULT 20,
+    full_text_weight FLOAT DEFAULT 1.0,
+    semantic_weight FLOAT DEFAULT 1.0,
+    rrf_k INT DEFAULT 60,
+    filter_book_id INT DEFAULT NULL
+)
+RETURNS TABLE(
+    hadith_id INT,
+    score FLOAT
+)
+LANGUAGE sql
+STABLE
+PARALLEL SAFE
+AS $$
+    WITH nearest AS (
+        -- Semantic search: nearest embeddings straight off the HNSW index.
+        -- The book filter is applied afterwards (over-fetching 3x) so it
+        -- never turns the index scan into a filtered sequential scan.
+        SELECT h.hadith_id, h.book_id, h.embedding <=> query_embedding AS distance
+        FROM hadiths h
+        WHERE h.embedding IS NOT NULL
+        ORDER BY h.embedding <=> query_embedding
+        LIMIT match_count * 2 * CASE WHEN filter_book_id IS NULL THEN 1 ELSE 3 END
+    ),
+    semantic AS (
+        SELECT
+            n.hadith_id,
+            ROW_NUMBER() OVER (ORDER BY n.distance) AS rank
+        FROM nearest n
+        WHERE filter_book_id IS NULL OR n.book_id = filter_book_id
+        ORDER BY n.distance
+        LIMIT match_count * 2
+    ),
+    fulltext AS (
+        -- Full-text search: find hadiths matching keywords
+        -- (web-search syntax: "quoted phrases", or, -excluded)
+        SELECT
+            h.hadith_id,
+            ROW_NUMBER() OVER (
+                ORDER BY ts_rank_cd(h.fts_en, websearch_to_tsquery('english', query_text)) DESC
+            ) AS rank
+        FROM hadiths h
+        WHERE h.fts_en @@ websearch_to_tsquery('english', query_text)
+          AND (filter_book_id IS NULL OR h.book_id = filter_book_id)
+        ORDER BY rank
+        LIMIT match_count * 2
+    )
+    -- Combine using Reciprocal Rank Fusion
+    -- RRF score = sum of 1/(k + rank) for each search method
+    SELECT
+        COALESCE(s.hadith_id, f.hadith_id) AS hadith_id,
+        (
+            COALESCE(semantic_weight / (rrf_k + s.rank), 0.0) +
+            COALESCE(full_text_weight / (rrf_k + f.rank), 0.0)
+        ) AS score
+    FROM semantic s
+    FULL OUTER JOIN fulltext f ON s.hadith_id = f.hadith_id
+    ORDER BY score DESC
+    LIMIT match_count;
+$$;
@@ -0,0 +1,137 @@
+-- ============================================================
+-- 006: Exact vector search when filtering by book
+-- ============================================================
+-- For databases created from an older supabase_schema.sql (new installs
+-- already have this). Run once in the Supabase SQL Editor, after 005.
+--
+-- 001 took the nearest neighbours from the HNSW index first and applied
+-- the book filter afterwards, over-fetching 3x. That only keeps results
+-- for a book holding a large share of the corpus: for the rest the
+-- corpus-wide nearest rows hold few or none of the book's hadiths, so a
+-- filtered search came back short or empty. A filtered search now sorts
+-- that book's rows by exact distance instead (a few thousand at most);
+-- unfiltered searches still read straight off the HNSW index.
+--
+-- Check: a filtered search returns match_count rows, for any book with at
+-- least that many embedded hadiths:
+--
+--   SELECT b.book_id, count(s.*)
+--   FROM books b
+--   CROSS JOIN LATERAL semantic_search(
+--       (SELECT embedding FROM hadiths WHERE hadith_id = 1), 20, b.book_id
+--   ) s
+--   GROUP BY b.book_id
+--   ORDER BY count(s.*);
+
+CREATE OR REPLACE FUNCTION hybrid_search(
+    query_text TEXT,
+    query_embedding halfvec(384),
+    match_count INT DEFAULT 20,
+    full_text_weight FLOAT DEFAULT 1.0,
+    semantic_weight FLOAT DEFAULT 1.0,
+    rrf_k INT DEFAULT 60,
+    filter_book_id INT DEFAULT NULL
+)
+RETURNS TABLE(
+    hadith_id INT,
+    score FLOAT
+)
+LANGUAGE sql
+STABLE
+PARALLEL SAFE
+AS $$
+    WITH nearest AS (
+        -- Semantic search, unfiltered: nearest embeddings straight off the
+        -- HNSW index
+        (
+            SELECT h.hadith_id, h.embedding <=> query_embedding AS distance
+            FROM hadiths h
+            WHERE filter_book_id IS NULL
+              AND h.embedding IS NOT NULL
+            ORDER BY h.embedding <=> query_embedding
+            LIMIT match_count * 2
+        )
+        UNION ALL
+        -- Semantic search, one book: exact distance sort over that book's
+        -- rows (a few thousand at most, found through idx_hadiths_book_number).
+        -- The "+ 0" keeps the planner off the HNSW index: its scan returns
+        -- the nearest rows corpus-wide, and filtering those by book would
+        -- leave too few, often none, for all but the largest books.
+        (
+            SELECT h.hadith_id, h.embedding <=> query_embedding AS distance
+            FROM hadiths h
+            WHERE h.book_id = filter_book_id
+              AND h.embedding IS NOT NULL
+            ORDER BY (h.embedding <=> query_embedding) + 0
+            LIMIT match_count * 2
+        )
+    ),
+    semantic AS (
+        SELECT
+            n.hadith_id,
+            ROW_NUMBER() OVER (ORDER BY n.distance) AS rank
+        FROM nearest n
+    ),
+    fulltext AS (
+        -- Full-text search: find hadiths matching keywords
+        -- (web-search syntax: "quoted phrases", OR, -excluded)
+        SELECT
+            h.hadith_id,
+            ROW_NUMBER() OVER (
+                ORDER BY ts_rank_cd(h.fts_en, websearch_to_tsquery('english', query_text)) DESC
+            ) AS rank
+        FROM hadiths h
+        WHERE h.fts_en @@ websearch_to_tsquery('english', query_text)
+          AND (filter_book_id IS NULL OR h.book_id = filter_book_id)
+        ORDER BY rank
+        LIMIT match_count * 2
+    )
+    -- Combine using Reciprocal Rank Fusion
+    -- RRF score = sum of 1/(k + rank) for each search method
+    SELECT
+        COALESCE(s.hadith_id, f.hadith_id) AS hadith_id,
+        (
+            COALESCE(semantic_weight / (rrf_k + s.rank), 0.0) +
+            COALESCE(full_text_weight / (rrf_k + f.rank), 0.0)
+        ) AS score
+    FROM semantic s
+    FULL OUTER JOIN fulltext f ON s.hadith_id = f.hadith_id
+    ORDER BY score DESC
+    LIMIT match_count;
+$$;
+
+CREATE OR REPLACE FUNCTION semantic_search(
+    query_embedding halfvec(384),
+    match_count INT DEFAULT 20,
+    filter_book_id INT DEFAULT NULL
+)
+RETURNS TABLE(
+    hadith_id INT,
+    similarity FLOAT
+)
+LANGUAGE sql
+STABLE
+PARALLEL SAFE
+AS $$
+    -- Unfiltered: nearest embeddings straight off the HNSW index.
+    -- One book: exact distance sort over that book's rows (see hybrid_search).
+    -- Only one branch runs; the other is cut by its constant filter.
+    (
+        SELECT h.hadith_id, 1 - (h.embedding <=> query_embedding) AS similarity
+        FROM hadiths h
+        WHERE filter_book_id IS NULL
+          AND h.embedding IS NOT NULL
+        ORDER BY h.embedding <=> query_embedding
+        LIMIT match_count
+    )
+    UNION ALL
+    (
+        SELECT h.hadith_id, 1 - (h.embedding <=> query_embedding) AS similarity
+        FROM hadiths h
+        WHERE h.book_id = filter_book_id
+          AND h.embedding IS NOT NULL
+        ORDER BY (h.embedding <=> query_embedding) + 0
+        LIMIT match_count
+    )
+    ORDER BY similarity DESC;
+$$;
@@ -69,7 +69,9 @@ CREATE TABLE IF NOT EXISTS hadiths (
 
     -- Semantic search: 384-dimensional embedding vector
     -- Generated by paraphrase-multilingual-MiniLM-L12-v2 model
-    embedding vector(384),
+    -- Stored as halfvec (fp16, pgvector >= 0.7): half the bytes per vector,
+    -- so the HNSW index and distance computations read half as much memory
+    embedding halfvec(384),
 
     -- Full-text search: auto-generated tsvector for English
     -- Weights: A (highest) for narrator, B for text
@@ -92,20 +94,24 @@ CREATE TABLE IF NOT EXISTS hadiths (
 
 -- Foreign key indexes (for JOIN performance)
 CREATE INDEX IF NOT EXISTS idx_chapters_book ON chapters(book_id, order_index);
-CREATE INDEX IF NOT EXISTS idx_hadiths_book_chapter ON hadiths(book_id, chapter_id);
+-- Book/chapter browsing: WHERE book_id [AND chapter_id] ORDER BY hadith_number
+CREATE INDEX IF NOT EXISTS idx_hadiths_book_chapter_number ON hadiths(book_id, chapter_id, hadith_number);
 CREATE INDEX IF NOT EXISTS idx_hadiths_book_number ON hadiths(book_id, hadith_number);
 CREATE INDEX IF NOT EXISTS idx_hadiths_grade ON hadiths(grade_id);
 
 -- Full-text search indexes (GIN = Generalized Inverted Index)
 -- Fast for searching within tsvector columns
-CREATE INDEX IF NOT EXISTS idx_hadiths_fts_en ON hadiths USING gin(fts_en);
-CREATE INDEX IF NOT EXISTS idx_hadiths_fts_ar ON hadiths USING gin(fts_ar);
+-- fastupdate=off: the table is bulk-loaded then read-only, so there is no
+-- write load to buffer and searches never scan a pending list
+CREATE INDEX IF NOT EXISTS idx_hadiths_fts_en ON hadiths USING gin(fts_en) WITH (fastupdate = off);
+CREATE INDEX IF NOT EXISTS idx_hadiths_fts_ar ON hadiths USING gin(fts_ar) WITH (fastupdate = off);
 
 -- Vector similarity search index (HNSW = Hierarchical Navigable Small World)
 -- Fast approximate nearest neighbor search for embeddings
 -- Parameters: m=16 (connections per node), ef_construction=64 (build quality)
+-- Query-time recall is tuned with hnsw.ef_search (set per query by the API)
 CREATE INDEX IF NOT EXISTS idx_hadiths_embedding ON hadiths
-    USING hnsw (embedding vector_cosine_ops)
+    USING hnsw (embedding halfvec_cosine_ops)
     WITH (m = 16, ef_construction = 64);
 
 -- ============================================================
@@ -115,7 +121,7 @@ CREATE INDEX IF NOT EXISTS idx_hadiths_embedding ON hadiths
 
 CREATE OR REPLACE FUNCTION hybrid_search(
     query_text TEXT,
-    query_embedding vector(384),
+    query_embedding halfvec(384),
     match_count INT DEFAULT 20,
     full_text_weight FLOAT DEFAULT 1.0,
     semantic_weight FLOAT DEFAULT 1.0,
@@ -128,27 +134,50 @@ RETURNS TABLE(
 )
 LANGUAGE sql
 STABLE
+PARALLEL SAFE
 AS $$
-    WITH semantic AS (
-        -- Semantic search: find hadiths with similar embeddings
+    WITH nearest AS (
+        -- Semantic search, unfiltered: nearest embeddings straight off the
+        -- HNSW index
+        (
+            SELECT h.hadith_id, h.embedding <=> query_embedding AS distance
+            FROM hadiths h
+            WHERE filter_book_id IS NULL
+              AND h.embedding IS NOT NULL
+            ORDER BY h.embedding <=> query_embedding
+            LIMIT match_count * 2
+        )
+        UNION ALL
+        -- Semantic search, one book: exact distance sort over that book's
+        -- rows (a few thousand at most, found through idx_hadiths_book_number).
+        -- The "+ 0" keeps the planner off the HNSW index: its scan returns
+        -- the nearest rows corpus-wide, and filtering those by book would
+        -- leave too few, often none, for all but the largest books.
+        (
+            SELECT h.hadith_id, h.embedding <=> query_embedding AS distance
+            FROM hadiths h
+            WHERE h.book_id = filter_book_id
+              AND h.embedding IS NOT NULL
+            ORDER BY (h.embedding <=> query_embedding) + 0
+            LIMIT match_count * 2
+        )
+    ),
+    semantic AS (
         SELECT
-            h.hadith_id,
-            ROW_NUMBER() OVER (ORDER BY h.embedding <=> query_embedding) AS rank
-        FROM hadiths h
-        WHERE (filter_book_id IS NULL OR h.book_id = filter_book_id)
-          AND h.embedding IS NOT NULL
-        ORDER BY h.embedding <=> query_embedding
-        LIMIT match_count * 2
+            n.hadith_id,
+            ROW_NUMBER() OVER (ORDER BY n.distance) AS rank
+        FROM nearest n
     ),
     fulltext AS (
         -- Full-text search: find hadiths matching keywords
+        -- (web-search syntax: "quoted phrases", OR, -excluded)
         SELECT
             h.hadith_id,
             ROW_NUMBER() OVER (
-                ORDER BY ts_rank_cd(h.fts_en, plainto_tsquery('english', query_text)) DESC
+                ORDER BY ts_rank_cd(h.fts_en, websearch_to_tsquery('english', query_text)) DESC
             ) AS rank
         FROM hadiths h
-        WHERE h.fts_en @@ plainto_tsquery('english', query_text)
+        WHERE h.fts_en @@ websearch_to_tsquery('english', query_text)
           AND (filter_book_id IS NULL OR h.book_id = filter_book_id)
         ORDER BY rank
         LIMIT match_count * 2
@@ -172,7 +201,7 @@ $$;
 -- ============================================================
 
 CREATE OR REPLACE FUNCTION semantic_search(
-    query_embedding vector(384),
+    query_embedding halfvec(384),
     match_count INT DEFAULT 20,
     filter_book_id INT DEFAULT NULL
 )
@@ -182,13 +211,27 @@ RETURNS TABLE(
 )
 LANGUAGE sql
 STABLE
+PARALLEL SAFE
 AS $$
-    SELECT
-        h.hadith_id,
-        1 - (h.embedding <=> query_embedding) AS similarity
-    FROM hadiths h
-    WHERE (filter_book_id IS NULL OR h.book_id = filter_book_id)
-      AND h.embedding IS NOT NULL
-    ORDER BY h.embedding <=> query_embedding
-    LIMIT match_count;
+    -- Unfiltered: nearest embeddings straight off the HNSW index.
+    -- One book: exact distance sort over that book's rows (see hybrid_search).
+    -- Only one branch runs; the other is cut by its constant filter.
+    (
+        SELECT h.hadith_id, 1 - (h.embedding <=> query_embedding) AS similarity
+        FROM hadiths h
+        WHERE filter_book_id IS NULL
+          AND h.embedding IS NOT NULL
+        ORDER BY h.embedding <=> query_embedding
+        LIMIT match_count
+    )
+    UNION ALL
+    (
+        SELECT h.hadith_id, 1 - (h.embedding <=> query_embedding) AS similarity
+        FROM hadiths h
+        WHERE h.book_id = filter_book_id
+          AND h.embedding IS NOT NULL
+        ORDER BY (h.embedding <=> query_embedding) + 0
+        LIMIT match_count
+    )
+    ORDER BY similarity DESC;
 $$;
@@ -0,0 +1,39 @@
+"""
+Gunicorn configuration for multi-worker deployments.
+
+Model memory:
+- Workers do not share the embedding model: every worker loads its own
+  copy in the app lifespan, after fork()
+- It cannot be loaded in the master instead: ONNX Runtime's intra-op
+  thread pool does not survive fork() (the first encode() can hang), and
+  a CUDA context cannot be re-initialized in a forked child
+- On CPU each copy is the int8 ONNX model (~120MB, a quarter of the fp32
+  weights); size WEB_CONCURRENCY to the host's memory
+
+Usage:
+    gunicorn -c gunicorn.conf.py app.main:app
+"""
+
+import os
+
+from uvicorn_worker import UvicornWorker
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+class UvloopHttptoolsWorker(UvicornWorker):
+    """
+    Uvicorn worker pinned to uvloop + httptools.
+
+    Uvicorn's "auto" silently falls back to asyncio + h11 when either is
+    missing; pinned, a broken install fails at worker boot instead.
+    """
+
+    CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "loop": "uvloop", "http": "httptools"}
+
+
+worker_class = UvloopHttptoolsWorker
+
+# Each worker loads and warms up the model at startup, so the default 30s is tight
+timeout = 120
@@ -8,6 +8,8 @@ from collections import Counter
 ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = ROOT / "database" / "sqlite.db"
 
+LANGS = ("ar", "en", "bn", "ur")
+
 STOPWORDS_EN = {
     "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of",
     "with", "by", "from", "as", "is", "was", "are", "were", "been", "be", "have",
@@ -32,32 +34,42 @@ STOPWORDS_AR = {
 }
 
 
+# Patterns compiled once; phonetic_code/extract_words run per word/hadith
+# The digraph rules are plain literals applied in order (each may act on
+# the output of the previous one), so they use str.replace, not regex
+_PHON_REPLACEMENTS = (
+    ("gh", "g"), ("kh", "k"), ("sh", "s"), ("th", "t"),
+    ("dh", "d"), ("zh", "z"), ("ph", "f"), ("qu", "k"),
+    ("ee", "i"), ("aa", "a"), ("oo", "u"), ("ou", "u"),
+    ("ei", "i"), ("ai", "a"), ("ay", "a"),
+)
+_STRIP_VOWELS = str.maketrans("", "", "aeiou")
+_NON_ALPHA_RE = re.compile(r"[^a-z]")
+_DUP_RE = re.compile(r"(.)\1+")
+_AR_RE = re.compile(r"[\u0600-\u06FF]+")
+_BN_UR_RE = re.compile(r"[\u0980-\u09FF\u0600-\u06FF]+")
+_EN_RE = re.compile(r"[a-z]+")
+
+
 def phonetic_code(s: str) -> str:
     """Generate phonetic code for fuzzy matching transliterations."""
     if not s:
         return ""
     
     s = s.lower().strip()
-    s = re.sub(r"[^a-z]", "", s)
+    s = _NON_ALPHA_RE.sub("", s)
     
     if len(s) < 2:
         return s
     
-    replacements = [
-        (r"gh", "g"), (r"kh", "k"), (r"sh", "s"), (r"th", "t"),
-        (r"dh", "d"), (r"zh", "z"), (r"ph", "f"), (r"qu", "k"),
-        (r"ee", "i"), (r"aa", "a"), (r"oo", "u"), (r"ou", "u"),
-        (r"ei", "i"), (r"ai", "a"), (r"ay", "a"),
-    ]
-    
     result = s
-    for pattern, repl in replacements:
-        result = re.sub(pattern, repl, result)
+    for pattern, repl in _PHON_REPLACEMENTS:
+        result = result.replace(pattern, repl)
     
     first = result[0]
-    rest = re.sub(r"[aeiou]", "", result[1:])
+    rest = result[1:].translate(_STRIP_VOWELS)
     result = first + rest
-    result = re.sub(r"(.)\1+", r"\1", result)
+    result = _DUP_RE.sub(r"\1", result)
     
     return result[:8]
 
@@ -67,14 +79,14 @@ def extract_words(text: str, lang: str) -> list:
         return []
 
     if lang == "ar":
-        words = re.findall(r"[\u0600-\u06FF]+", text)
+        words = _AR_RE.findall(text)
         words = [w for w in words if len(w) > 2 and w not in STOPWORDS_AR]
     elif lang in ("bn", "ur"):
-        words = re.findall(r"[\u0980-\u09FF\u0600-\u06FF]+", text)
+        words = _BN_UR_RE.findall(text)
         words = [w for w in words if len(w) > 2]
     else:
         text_lower = text.lower()
-        words = re.findall(r"[a-z]+", text_lower)
+        words = _EN_RE.findall(text_lower)
         words = [w for w in words if len(w) > 2 and w not in STOPWORDS_EN]
 
     return words
@@ -94,18 +106,17 @@ def main():
     rows = cur.fetchall()
     print(f"   Processing {len(rows)} hadiths...")
 
-    term_counts = {"ar": Counter(), "en": Counter(), "bn": Counter(), "ur": Counter()}
+    # Same order as the text columns selected above
+    counters = tuple(Counter() for _ in LANGS)
 
-    for hadith_id, ar_text, en_text, bn_text, ur_text in rows:
-        texts = {"ar": ar_text, "en": en_text, "bn": bn_text, "ur": ur_text}
-        for lang, text in texts.items():
+    for hadith_id, *texts in rows:
+        for lang, text, counter in zip(LANGS, texts, counters):
             if text:
-                words = extract_words(text, lang)
-                term_counts[lang].update(words)
+                counter.update(extract_words(text, lang))
 
     # Insert terms with frequency >= 2
     insert_data = []
-    for lang, counts in term_counts.items():
+    for lang, counts in zip(LANGS, counters):
         for term, freq in counts.items():
             if freq >= 2:
                 phon = phonetic_code(term) if lang == "en" else None
@@ -0,0 +1,36 @@
+# backend/scripts/export_onnx_model.py
+"""
+Export the embedding model to an int8 dynamically quantized ONNX file.
+
+Run once at build time (the Dockerfile builder stage does), so the API
+never exports at startup:
+
+    EMBEDDING_ONNX_QCONFIG=avx2 python scripts/export_onnx_model.py
+
+The file lands in EMBEDDING_MODEL_ONNX. Set EMBEDDING_ONNX_QCONFIG to the
+serving CPU's config (arm64, avx2, avx512 or avx512_vnni) when building
+on a different machine; it defaults to this host's CPU.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.services.embeddings import ONNX_QUANTIZED_FILES, export_quantized_onnx, get_onnx_qconfig
+
+
+def main():
+    qconfig = get_onnx_qconfig()
+    onnx_dir = Path(settings.EMBEDDING_MODEL_ONNX)
+
+    if (onnx_dir / ONNX_QUANTIZED_FILES[qconfig]).exists():
+        print(f"Quantized ONNX model already exported to {onnx_dir}")
+        return
+
+    export_quantized_onnx(onnx_dir, qconfig)
+
+
+if __name__ == "__main__":
+    main()
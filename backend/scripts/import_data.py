@@ -1,6 +1,7 @@
 # backend/scripts/import_data.py
 
 import csv
+import re
 import sqlite3
 from pathlib import Path
 
@@ -9,6 +10,26 @@ DATA = ROOT / "data"
 DB_PATH = ROOT / "backend" / "database" / "sqlite.db"
 SCHEMA_PATH = ROOT / "backend" / "database" / "schema.sql"
 
+_LEADING_COMMENTS = re.compile(r"^(\s*--[^\n]*\n)*")
+
+
+def strip_triggers(schema: str) -> str:
+    """Return the schema with its CREATE TRIGGER ... END; statements removed."""
+    # complete_statement() understands BEGIN ... END bodies, so the
+    # semicolons inside a trigger don't split it
+    statements, current = [], ""
+    for line in schema.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current)
+            current = ""
+    statements.append(current)
+    
+    return "".join(
+        stmt for stmt in statements
+        if not _LEADING_COMMENTS.sub("", stmt).lstrip().upper().startswith("CREATE TRIGGER")
+    )
+
 
 def import_csv(con: sqlite3.Connection, csv_path: Path, table: str, columns: list[str]) -> int:
     placeholders = ",".join("?" * len(columns))
@@ -17,13 +38,11 @@ def import_csv(con: sqlite3.Connection, csv_path: Path, table: str, columns: lis
     
     with csv_path.open("r", newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
-        rows = []
-        for r in reader:
-            row = tuple(r.get(c) or None for c in columns)
-            rows.append(row)
+        # Stream rows straight into executemany instead of building a list
+        rows = (tuple(r.get(c) or None for c in columns) for r in reader)
+        cur = con.executemany(sql, rows)
     
-    con.executemany(sql, rows)
-    return len(rows)
+    return cur.rowcount
 
 
 def main():
@@ -34,31 +53,33 @@ def main():
     
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     
-    con = sqlite3.connect(DB_PATH)
+    # Autocommit mode: transactions are opened/closed explicitly below
+    con = sqlite3.connect(DB_PATH, isolation_level=None)
+    con.execute("PRAGMA page_size = 8192")  # Must precede WAL and table creation
     con.execute("PRAGMA foreign_keys = OFF")  # Disable during import
     con.execute("PRAGMA journal_mode = WAL")
     con.execute("PRAGMA synchronous = NORMAL")
     con.execute("PRAGMA temp_store = MEMORY")
     con.execute("PRAGMA cache_size = -64000")  # 64MB cache
+    con.execute("PRAGMA mmap_size = 268435456")  # 256MB memory-mapped I/O
     
     # Create tables (without triggers initially for faster import)
     schema = SCHEMA_PATH.read_text(encoding="utf-8")
     
     # Remove trigger definitions temporarily
-    schema_no_triggers = "\n".join(
-        line for line in schema.split("\n") 
-        if "CREATE TRIGGER" not in line and "END;" not in line 
-        and "INSERT INTO hadiths_fts" not in line
-        and "VALUES ('delete'" not in line
-        and "NEW.hadith_id" not in line
-        and "OLD.hadith_id" not in line
-    )
-    
-    con.executescript(schema_no_triggers)
+    con.executescript(strip_triggers(schema))
     print("✅ Schema created")
     
-    # Import in FK-safe order
+    # Drop secondary indexes during the bulk load and rebuild them afterwards
+    indexes = con.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+    ).fetchall()
+    for name, _ in indexes:
+        con.execute(f'DROP INDEX "{name}"')
+    
+    # Import in FK-safe order; tables and FTS build share one transaction
     print("\n📥 Importing data...")
+    con.execute("BEGIN IMMEDIATE")
     
     n = import_csv(con, DATA / "books.csv", "books", [
         "book_id", "slug", "en_title", "bn_title", "ur_title", "ar_title", "description"
@@ -82,8 +103,6 @@ def main():
     ])
     print(f"   hadiths: {n}")
     
-    con.commit()
-    
     # Build FTS index
     print("\n🔍 Building FTS index...")
     con.execute("""
@@ -91,7 +110,14 @@ def main():
         SELECT hadith_id, en_text, ar_text, bn_text, ur_text, en_narrator, ar_narrator 
         FROM hadiths
     """)
-    con.commit()
+    
+    print(f"📇 Rebuilding {len(indexes)} indexes...")
+    for _, sql in indexes:
+        con.execute(sql)
+    
+    # Merge the FTS b-tree segments written during the bulk insert
+    con.execute("INSERT INTO hadiths_fts(hadiths_fts) VALUES ('optimize')")
+    con.execute("COMMIT")
     
     # Now create triggers for future updates
     print("⚡ Creating triggers...")
@@ -118,7 +144,6 @@ def main():
     con.execute("PRAGMA foreign_keys = ON")
     con.execute("VACUUM")
     con.execute("ANALYZE")
-    con.commit()
     
     # Verify
     print("\n📊 Verification:")
@@ -174,11 +174,13 @@ export default function BookDetailPage() {
 							))}
 						</div>
 
-						<Pagination
-							currentPage={hadiths.page}
-							totalPages={hadiths.pages}
-							onPageChange={handlePageChange}
-						/>
+						{hadiths.page !== null && hadiths.pages !== null && (
+							<Pagination
+								currentPage={hadiths.page}
+								totalPages={hadiths.pages}
+								onPageChange={handlePageChange}
+							/>
+						)}
 					</>
 				)}
 			</main>
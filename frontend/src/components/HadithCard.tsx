@@ -26,7 +26,7 @@ function getGradeStyle(grade: string | null) {
 }
 
 // Truncate helper
-function truncate(text: string | null, maxLength: number): string {
+function truncate(text: string | null | undefined, maxLength: number): string {
   if (!text) return '';
   if (text.length <= maxLength) return text;
   return text.slice(0, maxLength).trim() + '...';
@@ -6,14 +6,18 @@ export interface HadithResult {
   chapter_id: number;
   hadith_number: number;
   grade_id: number | null;
-  en_text: string | null;
-  ar_text: string;
-  bn_text: string | null;
-  ur_text: string | null;
-  en_narrator: string | null;
-  ar_narrator: string | null;
-  bn_narrator: string | null;
-  ur_narrator: string | null;
+  // All languages, unless the search was narrowed with `lang`
+  en_text?: string | null;
+  ar_text?: string;
+  bn_text?: string | null;
+  ur_text?: string | null;
+  en_narrator?: string | null;
+  ar_narrator?: string | null;
+  bn_narrator?: string | null;
+  ur_narrator?: string | null;
+  // Only with `lang`
+  text?: string | null;
+  narrator?: string | null;
   book_title: string;
   book_title_bn: string | null;
   book_slug: string;
@@ -90,7 +94,8 @@ export interface HadithListItem {
 export interface PaginatedHadiths {
   results: HadithListItem[];
   total: number;
-  page: number;
+  page: number | null; // null when paging with a cursor
   per_page: number;
-  pages: number;
+  pages: number | null; // null when paging with a cursor
+  next_cursor: number | null;
 }
\ No newline at end of file